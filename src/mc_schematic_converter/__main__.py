@@ -1,17 +1,21 @@
-"""CLI entry point: python -m mc_schematic_converter <input> <output>"""
+"""CLI entry point: python -m mc_schematic_converter <input> <output> [--verify]"""
 
-import sys
+import argparse
 
 from .converter import convert_v3_to_v2
 
 
 def main() -> None:
-    if len(sys.argv) < 3:
-        print(f'Usage: python -m mc_schematic_converter <input.schem> <output.schem>')
-        print()
-        print('Convert Sponge Schematic v3 to v2 for WorldEdit 7.2.x compatibility.')
-        sys.exit(1)
-    convert_v3_to_v2(sys.argv[1], sys.argv[2])
+    parser = argparse.ArgumentParser(
+        prog='python -m mc_schematic_converter',
+        description='Convert Sponge Schematic v3 to v2 for WorldEdit 7.2.x compatibility.',
+    )
+    parser.add_argument('input', help='input .schem file (Sponge Schematic v3)')
+    parser.add_argument('output', help='output .schem file (Sponge Schematic v2)')
+    parser.add_argument('--verify', action='store_true',
+                        help='re-read the written file and check its structure')
+    args = parser.parse_args()
+    convert_v3_to_v2(args.input, args.output, verify=args.verify)
 
 
 if __name__ == '__main__':
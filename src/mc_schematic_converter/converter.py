@@ -25,10 +25,21 @@ Known limitations:
 
 import gzip
 import math
+import zlib
 
 from .nbt import NBTReader, NBTWriter, find_tag
 
 
+# Tags the converter never inspects; kept as raw payload slices and copied
+# to the output without being decoded. 'components' is stripped anyway.
+_RAW_TAGS = frozenset({
+    (7, 'Data'),          # Blocks.Data (v3) -> BlockData (v2), often several MB
+    (10, 'Metadata'),
+    (10, 'Biomes'),
+    (10, 'components'),
+})
+
+
 def _convert_item(item_entries: list) -> list:
     """Convert a single item's tags from 1.21+ to 1.20.1 format.
 
@@ -104,23 +115,193 @@ def _convert_entity_nbt(entries: list) -> list:
     return new
 
 
-def _convert_block_entity_data(entries: list) -> list:
-    """Convert the inner Data compound of a v3 BlockEntity.
+def _convert_block_entity_data(entries: list, out: list) -> bool:
+    """Convert the inner Data compound of a v3 BlockEntity into `out`.
 
-    Processes Items lists and removes components.
+    Processes Items lists, removes components and drops the inner id (v2
+    keeps only the outer Id). Returns True if the data had an Items tag.
     """
-    new = []
+    has_items = False
     for tag_type, tag_name, tag_val in entries:
-        if tag_name == 'Items' and tag_val[0] == 'list':
-            new.append((tag_type, tag_name, _convert_items_list(tag_val)))
-        elif tag_name == 'components':
+        if tag_name == 'Items':
+            has_items = True
+            if tag_val[0] == 'list':
+                tag_val = _convert_items_list(tag_val)
+        elif tag_name == 'components' or tag_name == 'id':
             continue
-        else:
-            new.append((tag_type, tag_name, tag_val))
-    return new
+        out.append((tag_type, tag_name, tag_val))
+    return has_items
+
+
+def _read_gzip(path: str) -> bytes:
+    """Read and decompress a whole gzip file.
+
+    The file is read in one go and each gzip member is inflated with a single
+    zlib call (wbits=31 selects the gzip container). Schematics normally hold
+    one member, but concatenated members are decoded like gzip.open() does.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    members = []
+    while raw:
+        d = zlib.decompressobj(31)
+        members.append(d.decompress(raw))
+        if not d.eof:
+            raise EOFError('Compressed file ended before the end-of-stream marker was reached')
+        # Zero padding between/after members is allowed, as in the gzip module
+        raw = d.unused_data.lstrip(b'\x00')
+    return b''.join(members)
+
+
+def _split_entity(entries: list) -> tuple:
+    """Pick the Id, Pos and Data tags out of a v3 (block) entity compound.
+
+    Returns (id_tag, pos_tag, data_tag); each is the original
+    (tag_type, tag_name, tag_val) entry or None if absent.
+    """
+    id_tag = pos_tag = data_tag = None
+    for entry in entries:
+        name = entry[1]
+        if name == 'Id':
+            id_tag = entry
+        elif name == 'Pos':
+            pos_tag = entry
+        elif name == 'Data':
+            data_tag = entry
+    return id_tag, pos_tag, data_tag
+
+
+def _convert_block_entity(entity: tuple) -> tuple:
+    """Flatten one v3 BlockEntity {Id, Pos, Data: {...}} into v2 form.
+
+    Returns (compound_value, has_items). Each entity is independent of the
+    others and of any shared state.
+    """
+    id_tag, pos_tag, data_tag = _split_entity(entity[1])
+    new_entry = []
+    has_items = False
+
+    if id_tag is not None:
+        new_entry.append(id_tag)
+    if pos_tag is not None:
+        new_entry.append(pos_tag)
+
+    if data_tag is not None:
+        ecv = data_tag[2]
+        if ecv[0] == 'compound':
+            has_items = _convert_block_entity_data(ecv[1], new_entry)
+
+    return ('compound', new_entry), has_items
+
+
+def _convert_version(tag_type: int, tag_val: tuple, out: list) -> None:
+    """Version 3 -> 2."""
+    out.append((3, 'Version', ('int', 2)))
+    print('Version -> 2')
+
+
+def _convert_data_version(tag_type: int, tag_val: tuple, out: list) -> None:
+    """Pin DataVersion to 3465 (MC 1.20.1)."""
+    out.append((3, 'DataVersion', ('int', 3465)))
+    print(f'DataVersion {tag_val[1]} -> 3465 (1.20.1)')
+
+
+def _convert_entities(tag_type: int, tag_val: tuple, out: list) -> None:
+    """Unwrap each entity's Data compound and convert it to 1.20.1 format."""
+    # v3: {Id, Pos, Data: {id, Pos, Rotation, ...}}
+    # v2: {Id, Pos, Rotation, ...} (Data unwrapped)
+    if tag_val[0] == 'list' and tag_val[2]:
+        converted_entities = []
+        for entity in tag_val[2]:
+            if entity[0] != 'compound':
+                converted_entities.append(entity)
+                continue
+            id_tag, pos_tag, data_tag = _split_entity(entity[1])
+            new_entry = []
+            outer_pos_vals = None
+            inner_pos_vals = None
+            inner_block_pos = None
+            if id_tag is not None:
+                new_entry.append(id_tag)
+            if pos_tag is not None:
+                ecv = pos_tag[2]
+                if ecv[0] == 'list' and len(ecv[2]) >= 3:
+                    outer_pos_vals = [item[1] for item in ecv[2]]
+                new_entry.append(pos_tag)
+            if data_tag is not None:
+                ecv = data_tag[2]
+                if ecv[0] == 'compound':
+                    for dct, dcn, dcv in ecv[1]:
+                        if dcn == 'id':
+                            continue
+                        if dcn == 'Pos' and dcv[0] == 'list' and len(dcv[2]) >= 3:
+                            inner_pos_vals = [item[1] for item in dcv[2]]
+                            continue
+                        if dcn == 'block_pos' and dcv[0] == 'int_array' and dcv[1] == 3:
+                            inner_block_pos = dcv[2]
+                        new_entry.append((dct, dcn, dcv))
+            # Reconstruct precise relative Pos from absolute Data.Pos
+            if inner_pos_vals and inner_block_pos and outer_pos_vals:
+                offset = [inner_block_pos[i] - math.floor(outer_pos_vals[i]) for i in range(3)]
+                corrected = [inner_pos_vals[i] - offset[i] for i in range(3)]
+                for idx, (t, n, v) in enumerate(new_entry):
+                    if n == 'Pos':
+                        new_entry[idx] = (9, 'Pos', ('list', 6, [('double', p) for p in corrected]))
+                        break
+            new_entry = _convert_entity_nbt(new_entry)
+            converted_entities.append(('compound', new_entry))
+        out.append((9, 'Entities', ('list', 10, converted_entities)))
+        print(f'Entities: {len(converted_entities)} converted')
+    else:
+        print('Entities: 0')
+
 
+def _convert_offset(tag_type: int, tag_val: tuple, out: list) -> None:
+    """Reset Offset to the origin."""
+    out.append((11, 'Offset', ('int_array', 3, [0, 0, 0])))
+    print('Offset -> [0, 0, 0] (reset for v2 entity compatibility)')
 
-def convert_v3_to_v2(input_path: str, output_path: str) -> None:
+
+def _convert_blocks(tag_type: int, tag_val: tuple, out: list) -> None:
+    """Expand Blocks into Palette, PaletteMax, BlockData and BlockEntities."""
+    blocks = {bcn: (bct, bcv) for bct, bcn, bcv in tag_val[1]}
+
+    if 'Palette' in blocks:
+        bt, bv = blocks['Palette']
+        out.append((bt, 'Palette', bv))
+        palette_size = len(bv[1]) if bv[0] == 'compound' else 0
+        out.append((3, 'PaletteMax', ('int', palette_size)))
+        print(f'Palette: {palette_size} entries')
+
+    if 'Data' in blocks:
+        bt, bv = blocks['Data']
+        out.append((bt, 'BlockData', bv))
+        print('Blocks.Data -> BlockData')
+
+    if 'BlockEntities' in blocks:
+        bt, bv = blocks['BlockEntities']
+        converted = []
+        items_count = 0
+        for new_entity, has_items in map(_convert_block_entity, bv[2]):
+            converted.append(new_entity)
+            items_count += has_items
+
+        out.append((9, 'BlockEntities', ('list', 10, converted)))
+        print(f'BlockEntities: {len(converted)} total, {items_count} with items')
+
+
+# Top-level Schematic tags that need conversion, by name. Each handler appends
+# the v2 replacement tag(s) to `out`; all other tags are copied unchanged.
+_SCHEMATIC_HANDLERS = {
+    'Version': _convert_version,
+    'DataVersion': _convert_data_version,
+    'Entities': _convert_entities,
+    'Offset': _convert_offset,
+    'Blocks': _convert_blocks,
+}
+
+
+def convert_v3_to_v2(input_path: str, output_path: str, verify: bool = False) -> None:
     """Convert a Sponge Schematic v3 file to v2 format.
 
     Steps:
@@ -129,14 +310,16 @@ def convert_v3_to_v2(input_path: str, output_path: str) -> None:
       3. Flatten BlockEntity Data compounds
       4. Convert item format: count(Int)->Count(Byte), strip components
       5. Set Version=2, add PaletteMax
+
+    If verify is True, the written file is read back and its root name,
+    Version, Palette and BlockData are reported.
     """
     print(f'Input:  {input_path}')
     print(f'Output: {output_path}')
 
-    with gzip.open(input_path, 'rb') as f:
-        data = f.read()
+    data = _read_gzip(input_path)
 
-    reader = NBTReader(data)
+    reader = NBTReader(data, _RAW_TAGS)
     root_type = reader.read_ubyte()
     root_name = reader.read_string()
     root = reader.read_payload(root_type)
@@ -150,120 +333,19 @@ def convert_v3_to_v2(input_path: str, output_path: str) -> None:
     else:
         schem = root
 
-    _, ver = find_tag(schem, 'Version')
+    schem_map = {cn: (ct, cv) for ct, cn, cv in schem[1]}
+
+    _, ver = schem_map.get('Version', (None, None))
     if ver:
         print(f'Source version: {ver[1]}')
 
     v2_entries = []
     for ct, cn, cv in schem[1]:
-        if cn == 'Version':
-            v2_entries.append((3, 'Version', ('int', 2)))
-            print('Version -> 2')
-
-        elif cn == 'DataVersion':
-            v2_entries.append((3, 'DataVersion', ('int', 3465)))
-            print(f'DataVersion {cv[1]} -> 3465 (1.20.1)')
-
-        elif cn == 'Entities':
-            # v3: {Id, Pos, Data: {id, Pos, Rotation, ...}}
-            # v2: {Id, Pos, Rotation, ...} (Data unwrapped)
-            if cv[0] == 'list' and cv[2]:
-                converted_entities = []
-                for entity in cv[2]:
-                    if entity[0] != 'compound':
-                        converted_entities.append(entity)
-                        continue
-                    entity_map = {ecn: (ect, ecv) for ect, ecn, ecv in entity[1]}
-                    new_entry = []
-                    outer_pos_vals = None
-                    inner_pos_vals = None
-                    inner_block_pos = None
-                    if 'Id' in entity_map:
-                        ect, ecv = entity_map['Id']
-                        new_entry.append((ect, 'Id', ecv))
-                    if 'Pos' in entity_map:
-                        ect, ecv = entity_map['Pos']
-                        if ecv[0] == 'list' and len(ecv[2]) >= 3:
-                            outer_pos_vals = [item[1] for item in ecv[2]]
-                        new_entry.append((ect, 'Pos', ecv))
-                    if 'Data' in entity_map:
-                        ect, ecv = entity_map['Data']
-                        if ecv[0] == 'compound':
-                            for dct, dcn, dcv in ecv[1]:
-                                if dcn == 'id':
-                                    continue
-                                if dcn == 'Pos' and dcv[0] == 'list' and len(dcv[2]) >= 3:
-                                    inner_pos_vals = [item[1] for item in dcv[2]]
-                                    continue
-                                if dcn == 'block_pos' and dcv[0] == 'int_array' and dcv[1] == 3:
-                                    inner_block_pos = dcv[2]
-                                new_entry.append((dct, dcn, dcv))
-                    # Reconstruct precise relative Pos from absolute Data.Pos
-                    if inner_pos_vals and inner_block_pos and outer_pos_vals:
-                        offset = [inner_block_pos[i] - math.floor(outer_pos_vals[i]) for i in range(3)]
-                        corrected = [inner_pos_vals[i] - offset[i] for i in range(3)]
-                        for idx, (t, n, v) in enumerate(new_entry):
-                            if n == 'Pos':
-                                new_entry[idx] = (9, 'Pos', ('list', 6, [('double', p) for p in corrected]))
-                                break
-                    new_entry = _convert_entity_nbt(new_entry)
-                    converted_entities.append(('compound', new_entry))
-                v2_entries.append((9, 'Entities', ('list', 10, converted_entities)))
-                print(f'Entities: {len(converted_entities)} converted')
-            else:
-                print('Entities: 0')
-
-        elif cn == 'Offset':
-            v2_entries.append((11, 'Offset', ('int_array', 3, [0, 0, 0])))
-            print('Offset -> [0, 0, 0] (reset for v2 entity compatibility)')
-
-        elif cn == 'Blocks':
-            blocks = {bcn: (bct, bcv) for bct, bcn, bcv in cv[1]}
-
-            if 'Palette' in blocks:
-                bt, bv = blocks['Palette']
-                v2_entries.append((bt, 'Palette', bv))
-                palette_size = len(bv[1]) if bv[0] == 'compound' else 0
-                v2_entries.append((3, 'PaletteMax', ('int', palette_size)))
-                print(f'Palette: {palette_size} entries')
-
-            if 'Data' in blocks:
-                bt, bv = blocks['Data']
-                v2_entries.append((bt, 'BlockData', bv))
-                print('Blocks.Data -> BlockData')
-
-            if 'BlockEntities' in blocks:
-                bt, bv = blocks['BlockEntities']
-                converted = []
-                items_count = 0
-                for entity in bv[2]:
-                    entity_map = {ecn: (ect, ecv) for ect, ecn, ecv in entity[1]}
-                    new_entry = []
-
-                    if 'Id' in entity_map:
-                        ect, ecv = entity_map['Id']
-                        new_entry.append((ect, 'Id', ecv))
-                    if 'Pos' in entity_map:
-                        ect, ecv = entity_map['Pos']
-                        new_entry.append((ect, 'Pos', ecv))
-
-                    if 'Data' in entity_map:
-                        ect, ecv = entity_map['Data']
-                        if ecv[0] == 'compound':
-                            inner = _convert_block_entity_data(ecv[1])
-                            for dct, dcn, dcv in inner:
-                                if dcn == 'id':
-                                    continue
-                                new_entry.append((dct, dcn, dcv))
-                            if any(dcn == 'Items' for _, dcn, _ in inner):
-                                items_count += 1
-
-                    converted.append(('compound', new_entry))
-
-                v2_entries.append((9, 'BlockEntities', ('list', 10, converted)))
-                print(f'BlockEntities: {len(converted)} total, {items_count} with items')
-        else:
+        handler = _SCHEMATIC_HANDLERS.get(cn)
+        if handler is None:
             v2_entries.append((ct, cn, cv))
+        else:
+            handler(ct, cv, v2_entries)
 
     # Write v2 with Root("Schematic")
     writer = NBTWriter()
@@ -271,17 +353,21 @@ def convert_v3_to_v2(input_path: str, output_path: str) -> None:
     writer.write_string('Schematic')
     for ct, cn, cv in v2_entries:
         writer.write_ubyte(ct)
-        writer.write_string(cn)
+        writer.write_name(cn)
         writer.write_payload(ct, cv)
     writer.write_ubyte(0)
 
-    with gzip.open(output_path, 'wb') as f:
-        f.write(writer.get_bytes())
+    with open(output_path, 'wb') as f:
+        f.write(gzip.compress(writer.get_bytes(), compresslevel=6))
     print(f'Saved: {output_path}')
 
-    # Verify
-    with gzip.open(output_path, 'rb') as f:
-        verify_data = f.read()
+    if verify:
+        _verify_output(output_path)
+
+
+def _verify_output(output_path: str) -> None:
+    """Re-read a written v2 schematic and print its key structure."""
+    verify_data = _read_gzip(output_path)
     vr = NBTReader(verify_data)
     vr.read_ubyte()
     vrn = vr.read_string()
@@ -23,21 +23,87 @@ Internal representation:
     Each tag value is a tuple where the first element is the type name string.
     - Scalar:     ('byte', value), ('int', value), etc.
     - String:     ('string', value)
-    - Arrays:     ('byte_array', length, bytes), ('int_array', length, [ints]), ...
+    - Arrays:     ('byte_array', length, memoryview), ('int_array', length, array('i')),
+                  ('long_array', length, array('q'))
     - List:       ('list', element_tag_type, [items])
-    - Compound:   ('compound', [(child_tag_type, child_name, child_value), ...])
+    - Compound:   ('compound', Compound) as read, or ('compound', [(child_tag_type,
+                  child_name, child_value), ...]) as built by callers; both iterate
+                  as (child_tag_type, child_name, child_value) triples
+    - Raw:        ('raw', tag_type, memoryview) -- undecoded payload bytes, written
+                  back verbatim (see NBTReader raw_tags)
 """
 
-import io
+import array
 import struct
+import sys
+
+_UBYTE = struct.Struct('>B')
+_USHORT = struct.Struct('>H')
+_SHORT = struct.Struct('>h')
+_INT = struct.Struct('>i')
+_LONG = struct.Struct('>q')
+_FLOAT = struct.Struct('>f')
+_DOUBLE = struct.Struct('>d')
+
+# Primitive tag types that can be decoded in bulk: tag_type -> (type name, Struct)
+_PRIMITIVES = {
+    1: ('byte', _UBYTE),
+    2: ('short', _SHORT),
+    3: ('int', _INT),
+    4: ('long', _LONG),
+    5: ('float', _FLOAT),
+    6: ('double', _DOUBLE),
+}
+
+# array.array stores items in native byte order; NBT is always big-endian.
+_SWAP = sys.byteorder == 'little'
+
+
+class Compound:
+    """Children of a compound tag, stored as three parallel arrays.
+
+    Avoids one (type, name, value) tuple per child. Iterating yields the same
+    triples as the list form, so callers can treat both alike.
+    """
+
+    __slots__ = ('types', 'names', 'values')
+
+    def __init__(self, types: bytearray = None, names: list = None, values: list = None):
+        self.types = bytearray() if types is None else types
+        self.names = [] if names is None else names
+        self.values = [] if values is None else values
+
+    def __iter__(self):
+        return zip(self.types, self.names, self.values)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f'Compound({list(self)!r})'
+
+    def append(self, entry: tuple) -> None:
+        tag_type, name, value = entry
+        self.types.append(tag_type)
+        self.names.append(name)
+        self.values.append(value)
 
 
 class NBTReader:
-    """Read NBT binary data sequentially."""
+    """Read NBT binary data sequentially.
 
-    def __init__(self, data: bytes):
-        self.data = data
+    Compound children whose (tag_type, name) pair is in ``raw_tags`` are not
+    decoded; their payload is returned as a ('raw', tag_type, memoryview) slice
+    of the input so it can be passed through to NBTWriter unchanged.
+    """
+
+    def __init__(self, data: bytes, raw_tags: frozenset = frozenset()):
+        # Name slices are used as dict keys below, so they must be hashable
+        self.data = data if isinstance(data, bytes) else bytes(data)
         self.pos = 0
+        self.raw_tags = raw_tags
+        # Encoded compound child name -> decoded, interned str
+        self.names = {}
 
     def read(self, n: int) -> bytes:
         r = self.data[self.pos:self.pos + n]
@@ -45,141 +111,338 @@ class NBTReader:
         return r
 
     def read_ubyte(self) -> int:
-        return struct.unpack('>B', self.read(1))[0]
+        v = _UBYTE.unpack_from(self.data, self.pos)[0]
+        self.pos += 1
+        return v
 
     def read_short(self) -> int:
-        return struct.unpack('>h', self.read(2))[0]
+        v = _SHORT.unpack_from(self.data, self.pos)[0]
+        self.pos += 2
+        return v
 
     def read_int(self) -> int:
-        return struct.unpack('>i', self.read(4))[0]
+        v = _INT.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return v
 
     def read_long(self) -> int:
-        return struct.unpack('>q', self.read(8))[0]
+        v = _LONG.unpack_from(self.data, self.pos)[0]
+        self.pos += 8
+        return v
 
     def read_float(self) -> float:
-        return struct.unpack('>f', self.read(4))[0]
+        v = _FLOAT.unpack_from(self.data, self.pos)[0]
+        self.pos += 4
+        return v
 
     def read_double(self) -> float:
-        return struct.unpack('>d', self.read(8))[0]
+        v = _DOUBLE.unpack_from(self.data, self.pos)[0]
+        self.pos += 8
+        return v
 
     def read_string(self) -> str:
-        length = struct.unpack('>H', self.read(2))[0]
+        length = _USHORT.unpack_from(self.data, self.pos)[0]
+        self.pos += 2
         return self.read(length).decode('utf-8', errors='replace')
 
-    def read_payload(self, tag_type: int) -> tuple:
-        if tag_type == 1:
-            return ('byte', self.read_ubyte())
-        elif tag_type == 2:
-            return ('short', self.read_short())
-        elif tag_type == 3:
-            return ('int', self.read_int())
-        elif tag_type == 4:
-            return ('long', self.read_long())
-        elif tag_type == 5:
-            return ('float', self.read_float())
-        elif tag_type == 6:
-            return ('double', self.read_double())
-        elif tag_type == 7:
-            length = self.read_int()
-            return ('byte_array', length, self.read(length))
+    def read_array(self, typecode: str, length: int) -> array.array:
+        arr = array.array(typecode)
+        start = self.pos
+        self.skip(length * arr.itemsize)
+        # Copy straight from the input buffer, without an intermediate slice
+        arr.frombytes(memoryview(self.data)[start:self.pos])
+        if _SWAP:
+            arr.byteswap()
+        return arr
+
+    def read_length(self) -> int:
+        """Read an Int length/count prefix, rejecting negative values."""
+        length = self.read_int()
+        if length < 0:
+            raise ValueError(f"Negative NBT length: {length}")
+        return length
+
+    def skip(self, n: int) -> None:
+        """Advance past n bytes, which must lie within the input."""
+        end = self.pos + n
+        if n < 0 or end > len(self.data):
+            raise ValueError(f"Truncated NBT data: {n} bytes needed at offset {self.pos}")
+        self.pos = end
+
+    def skip_payload(self, tag_type: int) -> None:
+        # Iterative like read_payload. Frames are [None] for an open compound
+        # and [list_type, remaining] for an open list.
+        stack = []
+        while True:
+            if tag_type in _PRIMITIVES:
+                self.skip(_PRIMITIVES[tag_type][1].size)
+            elif tag_type == 10:
+                stack.append([None])
+            elif tag_type == 9:
+                list_type = self.read_ubyte()
+                count = self.read_length()
+                if list_type in _PRIMITIVES:
+                    self.skip(count * _PRIMITIVES[list_type][1].size)
+                elif count:
+                    stack.append([list_type, count])
+            elif tag_type == 7:
+                self.skip(self.read_length())
+            elif tag_type == 8:
+                self.skip(2 + _USHORT.unpack_from(self.data, self.pos)[0])
+            elif tag_type == 11:
+                self.skip(4 * self.read_length())
+            elif tag_type == 12:
+                self.skip(8 * self.read_length())
+            else:
+                raise ValueError(f"Unknown NBT tag type: {tag_type}")
+
+            # Find the next payload to skip, closing finished containers
+            while stack:
+                frame = stack[-1]
+                if frame[0] is None:
+                    tag_type = self.read_ubyte()
+                    if tag_type == 0:
+                        stack.pop()
+                        continue
+                    self.skip(2 + _USHORT.unpack_from(self.data, self.pos)[0])
+                    break
+                if frame[1]:
+                    frame[1] -= 1
+                    tag_type = frame[0]
+                    break
+                stack.pop()
+            else:
+                return
+
+    def read_payload_raw(self, tag_type: int) -> tuple:
+        start = self.pos
+        self.skip_payload(tag_type)
+        return ('raw', tag_type, memoryview(self.data)[start:self.pos])
+
+    def read_value(self, tag_type: int) -> tuple:
+        """Decode a payload that cannot contain nested tags (anything but list/compound)."""
+        primitive = _PRIMITIVES.get(tag_type)
+        if primitive is not None:
+            name, st = primitive
+            v = st.unpack_from(self.data, self.pos)[0]
+            self.pos += st.size
+            return (name, v)
         elif tag_type == 8:
             return ('string', self.read_string())
-        elif tag_type == 9:
-            list_type = self.read_ubyte()
-            count = self.read_int()
-            return ('list', list_type, [self.read_payload(list_type) for _ in range(count)])
-        elif tag_type == 10:
-            entries = []
-            while True:
-                child_type = self.read_ubyte()
-                if child_type == 0:
-                    break
-                child_name = self.read_string()
-                child_val = self.read_payload(child_type)
-                entries.append((child_type, child_name, child_val))
-            return ('compound', entries)
+        elif tag_type == 7:
+            length = self.read_length()
+            # Zero-copy view into the input; byte arrays (e.g. BlockData) can be
+            # several MB and are only ever written back unchanged.
+            start = self.pos
+            self.skip(length)
+            return ('byte_array', length, memoryview(self.data)[start:self.pos])
         elif tag_type == 11:
-            length = self.read_int()
-            return ('int_array', length, [self.read_int() for _ in range(length)])
+            length = self.read_length()
+            return ('int_array', length, self.read_array('i', length))
         elif tag_type == 12:
-            length = self.read_int()
-            return ('long_array', length, [self.read_long() for _ in range(length)])
+            length = self.read_length()
+            return ('long_array', length, self.read_array('q', length))
         else:
             raise ValueError(f"Unknown NBT tag type: {tag_type}")
 
+    def _open_container(self, tag_type: int) -> list:
+        """Read a list/compound header and return its parse frame.
+
+        Frames are [10, types, names, values] for compounds and
+        [9, list_type, remaining, items] for lists; the decoded children are
+        always collected at index 3. Lists of primitives are decoded here in
+        one go and come back as a frame with nothing remaining.
+        """
+        if tag_type == 10:
+            return [10, bytearray(), [], []]
+        list_type = self.read_ubyte()
+        count = self.read_length()
+        if list_type in _PRIMITIVES:
+            name, st = _PRIMITIVES[list_type]
+            start = self.pos
+            self.skip(count * st.size)
+            slab = memoryview(self.data)[start:self.pos]
+            return [9, list_type, 0, [(name, v) for (v,) in st.iter_unpack(slab)]]
+        return [9, list_type, count, []]
+
+    def read_payload(self, tag_type: int) -> tuple:
+        if tag_type != 9 and tag_type != 10:
+            return self.read_value(tag_type)
+
+        # Nested lists/compounds are parsed with an explicit stack of frames
+        # instead of recursion, so deep trees cost no Python call frames.
+        data = self.data
+        raw_tags = self.raw_tags
+        names = self.names
+        stack = [self._open_container(tag_type)]
+        while True:
+            frame = stack[-1]
+            if frame[0] == 10:
+                child_type = data[self.pos]
+                if child_type != 0:
+                    name_len = _USHORT.unpack_from(data, self.pos + 1)[0]
+                    start = self.pos + 3
+                    self.pos = start + name_len
+                    # A schematic repeats a small set of names thousands of times;
+                    # each distinct name is decoded once. Names are interned so the
+                    # converter's comparisons against literal tag names hit the
+                    # identity fast path.
+                    key = data[start:self.pos]
+                    child_name = names.get(key)
+                    if child_name is None:
+                        child_name = sys.intern(key.decode('utf-8', errors='replace'))
+                        names[key] = child_name
+                    frame[1].append(child_type)
+                    frame[2].append(child_name)
+                    if raw_tags and (child_type, child_name) in raw_tags:
+                        frame[3].append(self.read_payload_raw(child_type))
+                    elif child_type == 9 or child_type == 10:
+                        stack.append(self._open_container(child_type))
+                    else:
+                        frame[3].append(self.read_value(child_type))
+                    continue
+                self.pos += 1
+                value = ('compound', Compound(frame[1], frame[2], frame[3]))
+            else:
+                if frame[2]:
+                    frame[2] -= 1
+                    list_type = frame[1]
+                    if list_type == 9 or list_type == 10:
+                        stack.append(self._open_container(list_type))
+                    else:
+                        frame[3].append(self.read_value(list_type))
+                    continue
+                value = ('list', frame[1], frame[3])
+
+            stack.pop()
+            if not stack:
+                return value
+            stack[-1][3].append(value)
+
 
 class NBTWriter:
     """Write NBT binary data sequentially."""
 
     def __init__(self):
-        self.buf = io.BytesIO()
+        self.buf = bytearray()
+        # Tag name -> length-prefixed encoded name
+        self.names = {}
 
     def write(self, data: bytes) -> None:
-        self.buf.write(data)
+        self.buf += data
 
     def write_ubyte(self, v: int) -> None:
-        self.write(struct.pack('>B', v))
+        self.buf.append(v)
 
     def write_short(self, v: int) -> None:
-        self.write(struct.pack('>h', v))
+        self.buf += _SHORT.pack(v)
 
     def write_int(self, v: int) -> None:
-        self.write(struct.pack('>i', v))
+        self.buf += _INT.pack(v)
 
     def write_long(self, v: int) -> None:
-        self.write(struct.pack('>q', v))
+        self.buf += _LONG.pack(v)
 
     def write_float(self, v: float) -> None:
-        self.write(struct.pack('>f', v))
+        self.buf += _FLOAT.pack(v)
 
     def write_double(self, v: float) -> None:
-        self.write(struct.pack('>d', v))
+        self.buf += _DOUBLE.pack(v)
 
     def write_string(self, s: str) -> None:
         encoded = s.encode('utf-8')
-        self.write(struct.pack('>H', len(encoded)))
-        self.write(encoded)
-
-    def write_payload(self, tag_type: int, value: tuple) -> None:
-        if tag_type == 1:
-            self.write_ubyte(value[1])
-        elif tag_type == 2:
-            self.write_short(value[1])
-        elif tag_type == 3:
-            self.write_int(value[1])
-        elif tag_type == 4:
-            self.write_long(value[1])
-        elif tag_type == 5:
-            self.write_float(value[1])
-        elif tag_type == 6:
-            self.write_double(value[1])
+        self.buf += len(encoded).to_bytes(2, 'big')
+        self.buf += encoded
+
+    def write_array(self, typecode: str, values) -> None:
+        arr = array.array(typecode, values)
+        if _SWAP:
+            arr.byteswap()
+        self.write(arr.tobytes())
+
+    def write_name(self, name: str) -> None:
+        """Write a tag name; like write_string, but caches the encoding."""
+        encoded = self.names.get(name)
+        if encoded is None:
+            raw = name.encode('utf-8')
+            encoded = len(raw).to_bytes(2, 'big') + raw
+            self.names[name] = encoded
+        self.buf += encoded
+
+    def write_value(self, tag_type: int, value: tuple) -> None:
+        """Write a payload without nested tags, or a raw pass-through payload."""
+        primitive = _PRIMITIVES.get(tag_type)
+        if value[0] == 'raw':
+            self.write(value[2])
+        elif primitive is not None:
+            self.buf += primitive[1].pack(value[1])
         elif tag_type == 7:
             self.write_int(value[1])
             self.write(value[2])
         elif tag_type == 8:
             self.write_string(value[1])
-        elif tag_type == 9:
-            self.write_ubyte(value[1])
-            self.write_int(len(value[2]))
-            for item in value[2]:
-                self.write_payload(value[1], item)
-        elif tag_type == 10:
-            for ct, cn, cv in value[1]:
-                self.write_ubyte(ct)
-                self.write_string(cn)
-                self.write_payload(ct, cv)
-            self.write_ubyte(0)
         elif tag_type == 11:
             self.write_int(value[1])
-            for i in value[2]:
-                self.write_int(i)
+            self.write_array('i', value[2])
         elif tag_type == 12:
             self.write_int(value[1])
-            for i in value[2]:
-                self.write_long(i)
+            self.write_array('q', value[2])
+
+    def _open_container(self, tag_type: int, value: tuple) -> tuple:
+        """Write a list/compound header and return its (element_type, children) frame.
+
+        element_type is None for compounds, whose children are (type, name, value)
+        triples. Lists of primitives are written here in one go and come back
+        with no children left.
+        """
+        if tag_type == 10:
+            return None, iter(value[1])
+        list_type, items = value[1], value[2]
+        self.write_ubyte(list_type)
+        self.write_int(len(items))
+        if list_type in _PRIMITIVES:
+            # Format varies with the item count; struct caches compiled formats
+            code = _PRIMITIVES[list_type][1].format[-1]
+            self.write(struct.pack(f'>{len(items)}{code}', *[item[1] for item in items]))
+            return list_type, iter(())
+        return list_type, iter(items)
+
+    def write_payload(self, tag_type: int, value: tuple) -> None:
+        if (tag_type != 9 and tag_type != 10) or value[0] == 'raw':
+            self.write_value(tag_type, value)
+            return
+
+        # Nested lists/compounds are written with an explicit stack, mirroring
+        # NBTReader.read_payload, so nesting depth is not bounded by recursion.
+        buf = self.buf
+        stack = [self._open_container(tag_type, value)]
+        while stack:
+            element_type, children = stack[-1]
+            # Children is a shared iterator, so after descending into a nested
+            # container this loop resumes where it left off.
+            for child in children:
+                if element_type is None:
+                    ct, cn, cv = child
+                    buf.append(ct)
+                    self.write_name(cn)
+                else:
+                    ct, cv = element_type, child
+                if cv[0] == 'raw':
+                    buf += cv[2]
+                elif ct in _PRIMITIVES:
+                    buf += _PRIMITIVES[ct][1].pack(cv[1])
+                elif ct == 9 or ct == 10:
+                    stack.append(self._open_container(ct, cv))
+                    break
+                else:
+                    self.write_value(ct, cv)
+            else:
+                stack.pop()
+                if element_type is None:
+                    buf.append(0)
 
     def get_bytes(self) -> bytes:
-        return self.buf.getvalue()
+        return bytes(self.buf)
 
 
 def find_tag(compound: tuple, name: str) -> tuple:
@@ -187,6 +450,13 @@ def find_tag(compound: tuple, name: str) -> tuple:
 
     Returns (tag_type, value) or (None, None) if not found.
     """
+    entries = compound[1]
+    if isinstance(entries, Compound):
+        try:
+            i = entries.names.index(name)
+        except ValueError:
+            return None, None
+        return entries.types[i], entries.values[i]
     for ct, cn, cv in compound[1]:
         if cn == name:
             return ct, cv
@@ -0,0 +1,32 @@
+"""Builders for hand-written NBT test data."""
+
+import struct
+
+
+def name(s: str) -> bytes:
+    encoded = s.encode('utf-8')
+    return struct.pack('>H', len(encoded)) + encoded
+
+
+def tag(tag_type: int, tag_name: str, payload: bytes) -> bytes:
+    return bytes([tag_type]) + name(tag_name) + payload
+
+
+def compound(*children: bytes) -> bytes:
+    return b''.join(children) + b'\x00'
+
+
+def list_(list_type: int, items: list) -> bytes:
+    return bytes([list_type]) + struct.pack('>i', len(items)) + b''.join(items)
+
+
+def i32(*values: int) -> bytes:
+    return struct.pack(f'>{len(values)}i', *values)
+
+
+def int_array(*values: int) -> bytes:
+    return i32(len(values), *values)
+
+
+def doubles(*values: float) -> list:
+    return [struct.pack('>d', v) for v in values]
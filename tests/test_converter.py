@@ -0,0 +1,119 @@
+"""Tests for the v3 -> v2 converter."""
+
+import gzip
+import struct
+
+import pytest
+
+from mc_schematic_converter.converter import _read_gzip, convert_v3_to_v2
+
+from .helpers import compound, doubles, i32, int_array, list_, name, tag
+
+METADATA = compound(tag(8, 'Name', name('test')), tag(11, 'Origin', int_array(1, 2, 3)))
+PALETTE = compound(tag(3, 'minecraft:stone', i32(0)), tag(3, 'minecraft:air', i32(1)))
+BLOCK_DATA = i32(4) + b'\x00\x01\x01\x00'
+
+V3_INPUT = tag(10, '', compound(tag(10, 'Schematic', compound(
+    tag(3, 'Version', i32(3)),
+    tag(3, 'DataVersion', i32(3953)),
+    tag(10, 'Metadata', METADATA),
+    tag(2, 'Width', struct.pack('>h', 2)),
+    tag(11, 'Offset', int_array(-1, -2, -3)),
+    tag(10, 'Blocks', compound(
+        tag(10, 'Palette', PALETTE),
+        tag(7, 'Data', BLOCK_DATA),
+        tag(9, 'BlockEntities', list_(10, [
+            compound(
+                tag(8, 'Id', name('minecraft:chest')),
+                tag(11, 'Pos', int_array(0, 1, 0)),
+                tag(10, 'Data', compound(
+                    tag(8, 'id', name('minecraft:chest')),
+                    tag(9, 'Items', list_(10, [compound(
+                        tag(8, 'id', name('minecraft:stone')),
+                        tag(3, 'count', i32(200)),
+                        tag(1, 'Slot', b'\x02'),
+                        tag(10, 'components', compound(tag(8, 'minecraft:custom_name', name('x')))),
+                    )])),
+                    tag(10, 'components', compound()),
+                )),
+            ),
+            compound(
+                tag(8, 'Id', name('minecraft:sign')),
+                tag(11, 'Pos', int_array(1, 1, 0)),
+                tag(10, 'Data', compound(tag(8, 'id', name('minecraft:sign')))),
+            ),
+        ])),
+    )),
+    tag(9, 'Entities', list_(10, [compound(
+        tag(8, 'Id', name('minecraft:item_frame')),
+        tag(9, 'Pos', list_(6, doubles(0.5, 1.03125, 0.5))),
+        tag(10, 'Data', compound(
+            tag(8, 'id', name('minecraft:item_frame')),
+            tag(9, 'Pos', list_(6, doubles(100.5, 64.03125, -20.5))),
+            tag(11, 'block_pos', int_array(100, 64, -21)),
+            tag(1, 'facing', b'\x03'),
+            tag(11, 'UUID', int_array(1, 2, 3, 4)),
+            tag(8, 'Paper.Origin', name('world')),
+            tag(10, 'Item', compound(tag(8, 'id', name('minecraft:map')), tag(3, 'count', i32(1)))),
+        )),
+    )])),
+))))
+
+V2_EXPECTED = tag(10, 'Schematic', compound(
+    tag(3, 'Version', i32(2)),
+    tag(3, 'DataVersion', i32(3465)),
+    tag(10, 'Metadata', METADATA),
+    tag(2, 'Width', struct.pack('>h', 2)),
+    tag(11, 'Offset', int_array(0, 0, 0)),
+    tag(10, 'Palette', PALETTE),
+    tag(3, 'PaletteMax', i32(2)),
+    tag(7, 'BlockData', BLOCK_DATA),
+    tag(9, 'BlockEntities', list_(10, [
+        compound(
+            tag(8, 'Id', name('minecraft:chest')),
+            tag(11, 'Pos', int_array(0, 1, 0)),
+            tag(9, 'Items', list_(10, [compound(
+                tag(8, 'id', name('minecraft:stone')),
+                tag(1, 'Count', b'\x7f'),
+                tag(1, 'Slot', b'\x02'),
+            )])),
+        ),
+        compound(
+            tag(8, 'Id', name('minecraft:sign')),
+            tag(11, 'Pos', int_array(1, 1, 0)),
+        ),
+    ])),
+    tag(9, 'Entities', list_(10, [compound(
+        tag(8, 'Id', name('minecraft:item_frame')),
+        tag(9, 'Pos', list_(6, doubles(0.5, 1.03125, 0.5))),
+        tag(1, 'Facing', b'\x03'),
+        tag(10, 'Item', compound(tag(8, 'id', name('minecraft:map')), tag(1, 'Count', b'\x01'))),
+        tag(3, 'TileX', i32(0)),
+        tag(3, 'TileY', i32(1)),
+        tag(3, 'TileZ', i32(0)),
+    )])),
+))
+
+
+def test_convert_v3_to_v2_golden(tmp_path, capsys):
+    src = tmp_path / 'in.schem'
+    dst = tmp_path / 'out.schem'
+    src.write_bytes(gzip.compress(V3_INPUT))
+    convert_v3_to_v2(str(src), str(dst))
+    assert gzip.decompress(dst.read_bytes()) == V2_EXPECTED
+    out = capsys.readouterr().out
+    assert 'BlockEntities: 2 total, 1 with items' in out
+    assert 'Entities: 1 converted' in out
+
+
+def test_read_gzip_multi_member(tmp_path):
+    path = tmp_path / 'multi.gz'
+    path.write_bytes(gzip.compress(b'abc') + gzip.compress(b'def') + b'\x00\x00')
+    assert _read_gzip(str(path)) == b'abcdef'
+
+
+def test_read_gzip_truncated(tmp_path):
+    path = tmp_path / 'short.gz'
+    path.write_bytes(gzip.compress(b'abc' * 100)[:-10])
+    with pytest.raises(EOFError):
+        _read_gzip(str(path))
@@ -0,0 +1,133 @@
+"""Tests for the NBT reader/writer."""
+
+import struct
+
+import pytest
+
+from mc_schematic_converter.converter import _RAW_TAGS
+from mc_schematic_converter.nbt import Compound, NBTReader, NBTWriter
+
+from .helpers import compound, doubles, i32, int_array, list_, name, tag
+
+# Covers every tag type, primitive/empty/nested lists and the raw tags
+FIXTURE = tag(10, '', compound(
+    tag(1, 'byte', b'\xff'),
+    tag(2, 'short', struct.pack('>h', -300)),
+    tag(3, 'int', i32(-5)),
+    tag(4, 'long', struct.pack('>q', -2 ** 60)),
+    tag(5, 'float', struct.pack('>f', 1.5)),
+    tag(6, 'double', struct.pack('>d', -0.25)),
+    tag(7, 'bytes', i32(3) + b'\x00\x01\xff'),
+    tag(8, 'string', name('h\u00e9llo')),
+    tag(11, 'ints', int_array(1, -2, 2 ** 31 - 1)),
+    tag(12, 'longs', i32(2) + struct.pack('>2q', -1, 2 ** 62)),
+    tag(7, 'empty_bytes', i32(0)),
+    tag(11, 'empty_ints', i32(0)),
+    tag(9, 'byte_list', list_(1, [b'\x00', b'\xc8'])),
+    tag(9, 'short_list', list_(2, [struct.pack('>h', -7)])),
+    tag(9, 'int_list', list_(3, [i32(9), i32(-9)])),
+    tag(9, 'long_list', list_(4, [struct.pack('>q', 7)])),
+    tag(9, 'float_list', list_(5, [struct.pack('>f', 90.0), struct.pack('>f', 0.0)])),
+    tag(9, 'double_list', list_(6, doubles(0.5, 64.03125))),
+    tag(9, 'string_list', list_(8, [name('a'), name('')])),
+    tag(9, 'array_list', list_(11, [int_array(1, 2), int_array()])),
+    tag(9, 'empty_list', list_(0, [])),
+    tag(9, 'empty_compounds', list_(10, [])),
+    tag(9, 'list_of_lists', list_(9, [list_(3, [i32(1)]), list_(9, [list_(10, [compound()])]), list_(0, [])])),
+    tag(9, 'compounds', list_(10, [compound(tag(1, 'x', b'\x01')), compound()])),
+    tag(10, 'nested', compound(tag(10, 'deeper', compound(tag(9, 'l', list_(6, doubles(1.0))))))),
+    tag(10, 'Metadata', compound(tag(8, 'Name', name('raw')), tag(11, 'Origin', int_array(1, 2, 3)))),
+    tag(7, 'Data', i32(2) + b'\x05\x06'),
+    tag(10, 'components', compound(tag(9, 'lore', list_(8, [name('x')])))),
+))
+
+
+def _round_trip(data: bytes, raw_tags: frozenset = frozenset()) -> bytes:
+    reader = NBTReader(data, raw_tags)
+    tag_type = reader.read_ubyte()
+    tag_name = reader.read_string()
+    value = reader.read_payload(tag_type)
+    assert reader.pos == len(data)
+    writer = NBTWriter()
+    writer.write_ubyte(tag_type)
+    writer.write_string(tag_name)
+    writer.write_payload(tag_type, value)
+    return writer.get_bytes()
+
+
+@pytest.mark.parametrize('raw_tags', [frozenset(), _RAW_TAGS])
+def test_round_trip(raw_tags):
+    assert _round_trip(FIXTURE, raw_tags) == FIXTURE
+
+
+def test_decoded_values():
+    reader = NBTReader(FIXTURE, _RAW_TAGS)
+    reader.read_ubyte()
+    reader.read_string()
+    root = reader.read_payload(10)
+    assert isinstance(root[1], Compound)
+    values = {n: v for _, n, v in root[1]}
+    assert values['byte'] == ('byte', 255)
+    assert values['string'] == ('string', 'h\u00e9llo')
+    assert list(values['ints'][2]) == [1, -2, 2 ** 31 - 1]
+    assert list(values['longs'][2]) == [-1, 2 ** 62]
+    assert bytes(values['bytes'][2]) == b'\x00\x01\xff'
+    assert values['double_list'] == ('list', 6, [('double', 0.5), ('double', 64.03125)])
+    assert values['Metadata'][:2] == ('raw', 10)
+    assert values['Data'][:2] == ('raw', 7)
+    assert [item[1] for item in values['list_of_lists'][2]] == [3, 9, 0]
+
+
+def test_deep_nesting():
+    depth = 5000
+    payload = b''.join(b'\x09' + i32(1) for _ in range(depth)) + b'\x00' + i32(0)
+    data = tag(9, '', payload)
+    assert _round_trip(data) == data
+
+    # Also through the raw skip path
+    blob = tag(9, 'Metadata', payload) + b'\x00'
+    reader = NBTReader(blob, frozenset({(9, 'Metadata')}))
+    reader.read_payload(10)
+    assert reader.pos == len(blob)
+
+
+def test_raw_skip_rejects_negative_array_length():
+    # Metadata {x: int_array(len=-2)}; used to move pos backwards and loop forever
+    metadata = tag(11, 'x', struct.pack('>i', -2)) + b'\x00'
+    blob = tag(10, 'Metadata', metadata) + b'\x00'
+    with pytest.raises(ValueError):
+        NBTReader(blob, _RAW_TAGS).read_payload(10)
+
+
+def test_raw_skip_rejects_truncated_payload():
+    metadata = tag(7, 'x', struct.pack('>i', 100) + b'\x01\x02') + b'\x00'
+    blob = tag(10, 'Metadata', metadata) + b'\x00'
+    with pytest.raises(ValueError):
+        NBTReader(blob, _RAW_TAGS).read_payload(10)
+
+
+@pytest.mark.parametrize('payload', [
+    struct.pack('>i', -1),                                 # negative byte_array length
+    struct.pack('>i', 4) + b'\x01\x02',                    # short byte_array
+])
+def test_byte_array_rejects_bad_length(payload):
+    with pytest.raises(ValueError):
+        NBTReader(payload).read_payload(7)
+
+
+@pytest.mark.parametrize('tag_type', [11, 12])
+def test_int_long_array_rejects_bad_length(tag_type):
+    with pytest.raises(ValueError):
+        NBTReader(struct.pack('>i', -2)).read_payload(tag_type)
+    # Truncated by a whole element
+    itemsize = 4 if tag_type == 11 else 8
+    with pytest.raises(ValueError):
+        NBTReader(struct.pack('>i', 3) + bytes(2 * itemsize)).read_payload(tag_type)
+
+
+def test_primitive_list_rejects_bad_count():
+    with pytest.raises(ValueError):
+        NBTReader(b'\x03' + struct.pack('>i', -1)).read_payload(9)
+    # Slab truncated by a whole element would otherwise yield a shorter list
+    with pytest.raises(ValueError):
+        NBTReader(b'\x03' + struct.pack('>i', 3) + bytes(8)).read_payload(9)